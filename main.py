@@ -1,12 +1,16 @@
-import json
+import asyncio
 import logging
+import mmap
 import os
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
 from pathlib import Path
 from tempfile import NamedTemporaryFile
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 
+import ahocorasick
 import fcntl
+import orjson
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
@@ -16,6 +20,25 @@ app = FastAPI(title="OptivAI")
 
 DATA_FILE = Path("data/tools.json")
 LOCK_FILE = DATA_FILE.with_suffix(".lock")
+# Files written by save_tools wrap normalized records in a versioned envelope.
+SCHEMA_VERSION = 1
+
+# Parsed tools and their indexes, keyed on the data file's stat() so
+# steady-state requests skip the read and JSON decode. Every rebuild creates a
+# new snapshot and rebinds this name on the event loop, so a handler holding a
+# snapshot never sees a mix of two builds.
+_CACHE: Dict = {"stamp": None}
+# Keeps concurrent cache misses from parsing the file more than once.
+_REFRESH_LOCK = asyncio.Lock()
+# Serializes admin read-modify-write cycles against the cache and data file.
+_WRITE_LOCK = asyncio.Lock()
+# Admin mutations update the cache immediately; a background task persists
+# them, coalescing writes that land within this window into one save.
+WRITE_DEBOUNCE_SECONDS = 0.05
+# Delay before the writer retries a save that failed.
+WRITE_RETRY_SECONDS = 1.0
+_PENDING: Dict = {"tools": None, "skipped": [], "base": None, "changes": []}
+_WRITER: Dict = {"task": None, "event": None}
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("tools")
@@ -33,6 +56,10 @@ def _coerce_str_list(value) -> List[str]:
     return []
 
 
+_TRUE = frozenset({"true", "1", "yes", "y", "on"})
+_FALSE = frozenset({"false", "0", "no", "n", "off"})
+
+
 def _coerce_bool(value, default: bool = True) -> bool:
     if value is None:
         return default
@@ -40,9 +67,9 @@ def _coerce_bool(value, default: bool = True) -> bool:
         return value
     if isinstance(value, str):
         lowered = value.strip().lower()
-        if lowered in {"true", "1", "yes", "y", "on"}:
+        if lowered in _TRUE:
             return True
-        if lowered in {"false", "0", "no", "n", "off"}:
+        if lowered in _FALSE:
             return False
     return bool(value)
 
@@ -67,58 +94,421 @@ def normalize_tool(raw: Dict) -> Dict:
     return normalized
 
 
-def read_tools_file() -> List[Dict]:
+_STR_FIELDS = ("name", "description", "category", "pricing", "website")
+_LIST_FIELDS = ("tags", "features")
+
+
+def _is_normalized(record) -> bool:
+    """Cheap shape check for a record that claims to be normalized already."""
+
+    return (isinstance(record, dict)
+            and type(record.get("id")) is int
+            and isinstance(record.get("published"), bool)
+            and all(isinstance(record.get(field), str) for field in _STR_FIELDS)
+            and all(isinstance(record.get(field), list)
+                    and all(isinstance(item, str) for item in record[field])
+                    for field in _LIST_FIELDS))
+
+
+def _normalize_records(records: List, *,
+                       trust_normalized: bool) -> Tuple[List[Dict], List]:
+    """Normalize stored records; return them with the raw ones that failed.
+
+    With ``trust_normalized`` records that already pass ``_is_normalized``
+    are kept as-is, so only hand-edited entries pay for ``normalize_tool``.
+    Records that cannot be coerced are left out of the catalog but returned
+    unchanged so saves can write them back.
+    """
+
+    normalized = []
+    skipped = []
+    for raw in records:
+        if trust_normalized and _is_normalized(raw):
+            normalized.append(raw)
+            continue
+        if not isinstance(raw, dict):
+            logger.warning("Skipping non-object tool record in %s", DATA_FILE)
+            skipped.append(raw)
+            continue
+        try:
+            normalized.append(normalize_tool(raw))
+        except (TypeError, ValueError):
+            logger.warning("Skipping malformed tool record %r in %s",
+                           raw.get("id"), DATA_FILE)
+            skipped.append(raw)
+    return normalized, skipped
+
+
+def read_tools_file(*, locked: bool = True) -> Tuple[List[Dict], bool]:
+    """Return the stored tool records and whether they need normalizing.
+
+    Records inside a current ``schema_version`` envelope were normalized by
+    ``save_tools``; only entries that fail a shape check (e.g. after a hand
+    edit) still need ``normalize_tool``. A bare list is the legacy format and
+    must be normalized in full. Pass ``locked=False`` when the caller already
+    holds the exclusive lock.
+    """
+
     ensure_data_dir()
     if not DATA_FILE.exists():
-        return []
+        return [], False
 
     try:
-        with DATA_FILE.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-    except json.JSONDecodeError:
+        # Parse straight from a read-only mapping to avoid copying the file
+        # into an intermediate bytes buffer first.
+        lock = (acquire_file_lock(LOCK_FILE, shared=True) if locked
+                else nullcontext())
+        with lock, \
+                DATA_FILE.open("rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                memoryview(mapped) as view:
+            data = orjson.loads(view)
+    except ValueError:
+        # orjson.JSONDecodeError is a ValueError, as is mmap's refusal to map
+        # an empty file.
         logger.exception("Failed to decode JSON from %s", DATA_FILE)
-        return []
+        return [], False
     except OSError:
         logger.exception("Failed to read %s", DATA_FILE)
-        return []
+        return [], False
+
+    if isinstance(data, list):
+        return data, True
+
+    if (isinstance(data, dict)
+            and data.get("schema_version") == SCHEMA_VERSION
+            and isinstance(data.get("tools"), list)):
+        return data["tools"], False
+
+    logger.error("Tools data is not in a recognized format")
+    return [], False
+
+
+# Stamp for a missing data file; no real file has a negative size.
+_MISSING_FILE_STAMP = (0, 0, -1)
+
+
+def _data_file_stamp() -> Optional[Tuple[int, int, int]]:
+    # save_tools replaces the file, so the inode changes on every write even
+    # when the filesystem's mtime resolution is too coarse to notice.
+    try:
+        st = DATA_FILE.stat()
+    except FileNotFoundError:
+        return _MISSING_FILE_STAMP
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def _build_cache(tools: List[Dict]) -> Dict:
+    published = []
+    unpublished = []
+    for tool in tools:
+        if tool.get("published", True):
+            published.append(tool)
+        else:
+            unpublished.append(tool)
+    by_id: Dict[int, Dict] = {}
+    by_id_index: Dict[int, int] = {}
+    for index, tool in enumerate(tools):
+        # Keep the first record for a repeated id, as the linear scans did.
+        by_id.setdefault(tool["id"], tool)
+        by_id_index.setdefault(tool["id"], index)
+    search_blob = []
+    by_category: Dict[str, List[int]] = {}
+    by_pricing: Dict[str, List[int]] = {}
+    for index, tool in enumerate(published):
+        # Unit separators keep a match from spanning two fields or two tags.
+        search_blob.append("\x1f".join(
+            [tool["name"], tool["description"], *tool["tags"]]).lower())
+        by_category.setdefault(tool["category"].lower(), []).append(index)
+        by_pricing.setdefault(tool["pricing"].lower(), []).append(index)
+
+    return {
+        "tools": tools,
+        "published": published,
+        "unpublished": unpublished,
+        "search_blob": search_blob,
+        "by_category": by_category,
+        "by_pricing": by_pricing,
+        "categories": sorted(
+            {tool["category"] for tool in published if tool["category"]}),
+        "by_id": by_id,
+        "by_id_index": by_id_index,
+        "max_id": max((tool["id"] for tool in tools), default=0),
+    }
+
+
+@lru_cache(maxsize=1024)
+def _search_automaton(terms: Tuple[str, ...]) -> ahocorasick.Automaton:
+    automaton = ahocorasick.Automaton()
+    for index, term in enumerate(terms):
+        automaton.add_word(term, index)
+    automaton.make_automaton()
+    return automaton
+
+
+def _matches_all_terms(automaton: ahocorasick.Automaton, text: str,
+                       term_count: int) -> bool:
+    found = set()
+    for _, index in automaton.iter(text):
+        found.add(index)
+        if len(found) == term_count:
+            return True
+    return False
+
+
+def _cache_is_fresh() -> bool:
+    if _PENDING["tools"] is not None:
+        # Unflushed admin changes are newer than anything on disk.
+        return True
+    stamp = _data_file_stamp()
+    return stamp is not None and stamp == _CACHE["stamp"]
+
+
+def _read_snapshot() -> Dict:
+    """Parse the data file into a new cache snapshot; blocks on file I/O."""
 
-    if not isinstance(data, list):
-        logger.error("Tools data is not a list")
-        return []
+    stamp = _data_file_stamp()
+    records, needs_migration = read_tools_file()
+    records, skipped = _normalize_records(
+        records, trust_normalized=not needs_migration)
+    if needs_migration:
+        try:
+            save_tools(records, mutated_ids=set(), preserved=skipped)
+        except OSError:
+            logger.exception("Failed to migrate %s", DATA_FILE)
+        stamp = _data_file_stamp()
 
-    return data
+    snapshot = _build_cache(records)
+    snapshot["stamp"] = stamp
+    snapshot["skipped"] = skipped
+    return snapshot
 
 
-def load_tools() -> List[Dict]:
-    raw_tools = read_tools_file()
-    normalized_tools = []
-    for raw in raw_tools:
-        if isinstance(raw, dict):
-            normalized_tools.append(normalize_tool(raw))
-    return normalized_tools
+async def _load_cache() -> Dict:
+    """Return the cache snapshot, rebuilding it in a worker thread when stale."""
+
+    global _CACHE
+    if _cache_is_fresh():
+        return _CACHE
+
+    async with _REFRESH_LOCK:
+        if not _cache_is_fresh():
+            snapshot = await asyncio.to_thread(_read_snapshot)
+            # An admin change committed while we parsed is newer than disk.
+            if _PENDING["tools"] is None:
+                _CACHE = snapshot
+    return _CACHE
+
+
+def _open_shared_lock(path: Path) -> Optional[int]:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
 
 
 @contextmanager
-def acquire_file_lock(path: Path):
-    ensure_data_dir()
-    fd = os.open(path, os.O_CREAT | os.O_RDWR, 0o644)
+def acquire_file_lock(path: Path, *, shared: bool = False):
+    """Hold an advisory lock on ``path``; shared locks admit other readers.
+
+    Shared locks open the existing lock file read-only, so readers never need
+    write access to the data directory. If that fails (no writer has created
+    the file yet, or it is unreadable) the caller proceeds unlocked, which is
+    safe because writers replace the data file atomically.
+    """
+
+    if shared:
+        fd = _open_shared_lock(path)
+        if fd is None:
+            yield
+            return
+    else:
+        ensure_data_dir()
+        fd = os.open(path, os.O_CREAT | os.O_RDWR, 0o644)
     try:
-        fcntl.flock(fd, fcntl.LOCK_EX)
+        if not shared:
+            fcntl.flock(fd, fcntl.LOCK_EX)
         yield
     finally:
         fcntl.flock(fd, fcntl.LOCK_UN)
         os.close(fd)
 
 
-def save_tools(tools: List[Dict]) -> None:
-    normalized = [normalize_tool(tool) for tool in tools]
+def _write_tools_file(tools: List[Dict], preserved: List) -> None:
+    """Atomically replace the data file; the caller holds the exclusive lock."""
+
+    with NamedTemporaryFile("wb", dir=str(DATA_FILE.parent),
+                            delete=False) as tmp:
+        payload = {"schema_version": SCHEMA_VERSION,
+                   "tools": tools + preserved}
+        tmp.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+        tmp.flush()
+        os.fsync(tmp.fileno())
+    os.replace(tmp.name, DATA_FILE)
+
+
+def save_tools(tools: List[Dict],
+               mutated_ids: Optional[Set[int]] = None,
+               preserved: Optional[List] = None) -> None:
+    """Persist ``tools``, normalizing only the records in ``mutated_ids``.
+
+    Records that came out of the cache are already normalized, so callers
+    name the ones they touched; ``None`` normalizes everything. Raw records
+    in ``preserved`` (ones the loader could not coerce) are appended as-is.
+    """
+
+    if mutated_ids is None:
+        normalized = [normalize_tool(tool) for tool in tools]
+    else:
+        normalized = [
+            normalize_tool(tool) if tool["id"] in mutated_ids else tool
+            for tool in tools
+        ]
+    with acquire_file_lock(LOCK_FILE):
+        _write_tools_file(normalized, preserved or [])
+
+
+def _apply_changes(tools: List[Dict], changes: List[Tuple]) -> List[Dict]:
+    """Replay admin ``changes`` onto ``tools`` as saved by another process.
+
+    A created tool whose id was taken meanwhile is renumbered; an update to a
+    tool that was deleted meanwhile is dropped.
+    """
+
+    tools = list(tools)
+    for action, value in changes:
+        if action == "delete":
+            tools = [tool for tool in tools if tool["id"] != value]
+            continue
+        index = next((index for index, tool in enumerate(tools)
+                      if tool["id"] == value["id"]), None)
+        if action == "create":
+            if index is not None:
+                new_id = max(tool["id"] for tool in tools) + 1
+                logger.warning("Tool id %d was taken on disk; saving as %d",
+                               value["id"], new_id)
+                value = {**value, "id": new_id}
+            tools.append(value)
+        elif index is None:
+            logger.warning("Tool %d was deleted on disk; dropping its update",
+                           value["id"])
+        else:
+            tools[index] = value
+    return tools
+
+
+def _save_changes(tools: List[Dict], preserved: List, base: Optional[Tuple],
+                  changes: List[Tuple]) -> Optional[Tuple]:
+    """Persist an admin-edited list derived from the file at stamp ``base``.
+
+    If another process replaced the file since, ``changes`` are re-applied to
+    its records instead of overwriting them. Returns the new stamp when
+    ``tools`` was written as given, or None after a re-apply.
+    """
+
     with acquire_file_lock(LOCK_FILE):
-        with NamedTemporaryFile("w", dir=str(DATA_FILE.parent), delete=False,
-                                encoding="utf-8") as tmp:
-            json.dump(normalized, tmp, indent=2, ensure_ascii=False)
-            tmp.flush()
-            os.fsync(tmp.fileno())
-        os.replace(tmp.name, DATA_FILE)
+        if _data_file_stamp() != base:
+            logger.warning("%s changed on disk; re-applying %d admin change(s)",
+                           DATA_FILE, len(changes))
+            records, needs_migration = read_tools_file(locked=False)
+            records, preserved = _normalize_records(
+                records, trust_normalized=not needs_migration)
+            _write_tools_file(_apply_changes(records, changes), preserved)
+            return None
+        _write_tools_file(tools, preserved)
+        return _data_file_stamp()
+
+
+async def _commit_tools(tools: List[Dict], change: Tuple) -> None:
+    """Apply an admin change to the cache and schedule it to be persisted.
+
+    ``tools`` is the cached list with the change made; ``change`` is
+    ``("create" | "update", record)`` or ``("delete", tool_id)`` and is kept
+    so the write can be replayed if another process saves first.
+    """
+
+    global _CACHE
+    if _PENDING["tools"] is None:
+        base, changes = _CACHE["stamp"], [change]
+    else:
+        base, changes = _PENDING["base"], [*_PENDING["changes"], change]
+    skipped = _CACHE["skipped"]
+    event = _WRITER["event"]
+    if event is None:
+        # No background writer (not started yet or shutting down).
+        await asyncio.to_thread(_save_changes, tools, skipped, base, changes)
+        # The saved list was derived from any pending one, so it supersedes it.
+        _PENDING.update(tools=None, changes=[])
+        return
+
+    snapshot = _build_cache(tools)
+    snapshot["stamp"] = None
+    snapshot["skipped"] = skipped
+    _CACHE = snapshot
+    _PENDING.update(tools=tools, skipped=skipped, base=base, changes=changes)
+    event.set()
+
+
+async def _flush_pending_tools() -> bool:
+    """Persist the pending tool list; return False if the save failed."""
+
+    tools = _PENDING["tools"]
+    if tools is None:
+        return True
+
+    changes = _PENDING["changes"]
+    save = asyncio.ensure_future(asyncio.to_thread(
+        _save_changes, tools, _PENDING["skipped"], _PENDING["base"], changes))
+    try:
+        await asyncio.wait([save])
+    except asyncio.CancelledError:
+        # Let an in-flight write land before anything writes a newer list.
+        await asyncio.wait([save])
+        _finish_flush(save, tools, changes)
+        raise
+    return _finish_flush(save, tools, changes)
+
+
+def _finish_flush(save: asyncio.Future, tools: List[Dict],
+                  changes: List[Tuple]) -> bool:
+    if save.exception() is not None:
+        logger.error("Failed to persist pending tool changes",
+                     exc_info=save.exception())
+        return False
+
+    # Runs on the event loop, so _commit_tools cannot slip a newer list in
+    # between this check and the reset.
+    if _PENDING["tools"] is tools:
+        _PENDING.update(tools=None, changes=[])
+    else:
+        # Newer changes were made on top of what was just written; only they
+        # still need saving, relative to the file as it now stands.
+        _PENDING["base"] = save.result()
+        _PENDING["changes"] = _PENDING["changes"][len(changes):]
+    return True
+
+
+async def _run_background_writer(event: asyncio.Event) -> None:
+    while True:
+        await event.wait()
+        try:
+            await asyncio.sleep(WRITE_DEBOUNCE_SECONDS)
+            event.clear()
+            flushed = await _flush_pending_tools()
+        except Exception:
+            logger.exception("Background tool writer failed")
+            flushed = False
+        if not flushed:
+            await asyncio.sleep(WRITE_RETRY_SECONDS)
+            event.set()
 
 
 class ToolCreate(BaseModel):
@@ -153,8 +543,39 @@ class ToolUpdate(BaseModel):
         return _coerce_str_list(value)
 
 
-def get_published_tools() -> List[Dict]:
-    return [tool for tool in load_tools() if tool.get("published", True)]
+class ToolOut(BaseModel):
+    id: int
+    name: str
+    description: str
+    category: str
+    pricing: str
+    tags: List[str]
+    features: List[str]
+    website: str
+    published: bool
+
+
+@app.on_event("startup")
+async def start_background_writer() -> None:
+    event = asyncio.Event()
+    _WRITER["event"] = event
+    _WRITER["task"] = asyncio.create_task(_run_background_writer(event))
+
+
+@app.on_event("shutdown")
+async def stop_background_writer() -> None:
+    task = _WRITER["task"]
+    _WRITER["event"] = None
+    _WRITER["task"] = None
+    if task is not None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    async with _WRITE_LOCK:
+        if not await _flush_pending_tools():
+            logger.error("Pending tool changes were not saved on shutdown")
 
 
 @app.get("/")
@@ -172,7 +593,7 @@ async def admin_tools_new_page():
     return FileResponse("static/admin/new.html")
 
 
-@app.get("/api/tools")
+@app.get("/api/tools", response_model=List[ToolOut])
 async def get_tools(
         search: Optional[str] = Query(
             None, description="Search keyword for name, description, or tags"),
@@ -181,41 +602,44 @@ async def get_tools(
         pricing: Optional[str] = Query(
             None,
             description="Filter by pricing type (free, paid, free/paid)")):
-    tools = get_published_tools()
-
-    if search:
-        search_lower = search.lower()
-        tools = [
-            tool for tool in tools if search_lower in tool["name"].lower()
-            or search_lower in tool["description"].lower() or any(
-                search_lower in tag.lower() for tag in tool["tags"])
-        ]
+    cache = await _load_cache()
+    published = cache["published"]
 
     if category:
-        tools = [
-            tool for tool in tools
-            if tool["category"].lower() == category.lower()
-        ]
+        candidates = cache["by_category"].get(category.lower(), [])
+    else:
+        candidates = range(len(published))
 
     if pricing:
-        tools = [
-            tool for tool in tools
-            if pricing.lower() in tool["pricing"].lower()
-        ]
-
-    return tools
-
-
-@app.get("/api/tools/{tool_id}")
-async def get_tool(tool_id: int):
-    tools = get_published_tools()
-    tool = next((t for t in tools if t["id"] == tool_id), None)
-    if tool is None:
-        raise HTTPException(status_code=404, detail="Tool not found")
-    return tool
-
-
-@app.get("/api/tools/compare")
+        pricing_lower = pricing.lower()
+        allowed = set()
+        for value, indices in cache["by_pricing"].items():
+            if pricing_lower in value:
+                allowed.update(indices)
+        candidates = [index for index in candidates if index in allowed]
+
+    # A search made only of whitespace has no terms and filters nothing.
+    terms = tuple(dict.fromkeys(search.lower().split())) if search else ()
+    if terms:
+        search_blob = cache["search_blob"]
+        if len(terms) > 1:
+            # Every term must appear somewhere; one automaton pass per tool
+            # finds them all instead of a substring scan per term.
+            automaton = _search_automaton(terms)
+            candidates = [
+                index for index in candidates
+                if _matches_all_terms(automaton, search_blob[index], len(terms))
+            ]
+        else:
+            term = terms[0]
+            candidates = [
+                index for index in candidates if term in search_blob[index]
+            ]
+
+    return [published[index] for index in candidates]
+
+
+@app.get("/api/tools/compare", response_model=List[ToolOut])
 async def compare_tools(ids: str = Query(
     ..., description="Comma-separated tool IDs (max 3)")):
     try:
@@ -227,59 +651,75 @@ async def compare_tools(ids: str = Query(
         raise HTTPException(status_code=400,
                             detail="Maximum 3 tools can be compared")
 
-    tools = get_published_tools()
-    selected_tools = [tool for tool in tools if tool["id"] in tool_ids]
+    cache = await _load_cache()
+    by_id = cache["by_id"]
+    selected_tools = []
+    for tool_id in dict.fromkeys(tool_ids):
+        tool = by_id.get(tool_id)
+        if tool is not None and tool.get("published", True):
+            selected_tools.append(tool)
 
     return selected_tools
 
 
-@app.get("/api/categories")
+@app.get("/api/tools/{tool_id}", response_model=ToolOut)
+async def get_tool(tool_id: int):
+    cache = await _load_cache()
+    tool = cache["by_id"].get(tool_id)
+    if tool is None or not tool.get("published", True):
+        raise HTTPException(status_code=404, detail="Tool not found")
+    return tool
+
+
+@app.get("/api/categories", response_model=List[str])
 async def get_categories():
-    tools = get_published_tools()
-    categories = sorted({tool["category"] for tool in tools if tool["category"]})
-    return categories
+    cache = await _load_cache()
+    return cache["categories"]
 
 
-@app.get("/api/admin/tools")
+@app.get("/api/admin/tools", response_model=List[ToolOut])
 async def admin_get_tools(published: Optional[bool] = Query(
         None, description="Filter results by published state")):
-    tools = load_tools()
-    if published is not None:
-        tools = [tool for tool in tools if tool.get("published", True) == published]
-    return tools
+    cache = await _load_cache()
+    if published is None:
+        return cache["tools"]
+    return cache["published"] if published else cache["unpublished"]
 
 
-@app.post("/api/admin/tools", status_code=201)
+@app.post("/api/admin/tools", status_code=201, response_model=ToolOut)
 async def admin_create_tool(tool: ToolCreate):
-    tools = load_tools()
-    next_id = max((existing["id"] for existing in tools), default=0) + 1
-    new_tool = tool.dict()
-    new_tool["id"] = next_id
-    tools.append(new_tool)
-    save_tools(tools)
-    return normalize_tool(new_tool)
+    async with _WRITE_LOCK:
+        cache = await _load_cache()
+        new_tool = normalize_tool({**tool.dict(), "id": cache["max_id"] + 1})
+        tools = list(cache["tools"])
+        tools.append(new_tool)
+        await _commit_tools(tools, ("create", new_tool))
+    return new_tool
 
 
-@app.patch("/api/admin/tools/{tool_id}")
+@app.patch("/api/admin/tools/{tool_id}", response_model=ToolOut)
 async def admin_update_tool(tool_id: int, updates: ToolUpdate):
     update_data = updates.dict(exclude_unset=True)
-    tools = load_tools()
-    for index, tool in enumerate(tools):
-        if tool["id"] == tool_id:
-            updated_tool = {**tool, **update_data}
-            tools[index] = updated_tool
-            save_tools(tools)
-            return normalize_tool(updated_tool)
-    raise HTTPException(status_code=404, detail="Tool not found")
+    async with _WRITE_LOCK:
+        cache = await _load_cache()
+        index = cache["by_id_index"].get(tool_id)
+        if index is None:
+            raise HTTPException(status_code=404, detail="Tool not found")
+        tools = list(cache["tools"])
+        updated_tool = normalize_tool({**tools[index], **update_data})
+        tools[index] = updated_tool
+        await _commit_tools(tools, ("update", updated_tool))
+    return updated_tool
 
 
 @app.delete("/api/admin/tools/{tool_id}")
 async def admin_delete_tool(tool_id: int):
-    tools = load_tools()
-    remaining = [tool for tool in tools if tool["id"] != tool_id]
-    if len(remaining) == len(tools):
-        raise HTTPException(status_code=404, detail="Tool not found")
-    save_tools(remaining)
+    async with _WRITE_LOCK:
+        cache = await _load_cache()
+        if tool_id not in cache["by_id"]:
+            raise HTTPException(status_code=404, detail="Tool not found")
+        tools = [tool for tool in cache["tools"] if tool["id"] != tool_id]
+        await _commit_tools(tools, ("delete", tool_id))
     return {"status": "deleted"}
 
 
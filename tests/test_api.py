@@ -0,0 +1,306 @@
+import asyncio
+import importlib.util
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def data_file(tmp_path, monkeypatch):
+    path = tmp_path / "tools.json"
+    shutil.copy(ROOT / "data" / "tools.json", path)
+    monkeypatch.setattr(main, "DATA_FILE", path)
+    monkeypatch.setattr(main, "LOCK_FILE", path.with_suffix(".lock"))
+    monkeypatch.setattr(main, "_CACHE", {"stamp": None})
+    monkeypatch.setattr(main, "_PENDING", {
+        "tools": None, "skipped": [], "base": None, "changes": []})
+    monkeypatch.setattr(main, "_WRITER", {"task": None, "event": None})
+    monkeypatch.setattr(main, "_REFRESH_LOCK", asyncio.Lock())
+    monkeypatch.setattr(main, "_WRITE_LOCK", asyncio.Lock())
+    return path
+
+
+@pytest.fixture
+def client(data_file):
+    with TestClient(main.app) as client:
+        yield client
+
+
+def test_compare_is_not_shadowed_by_tool_detail_route(client):
+    response = client.get("/api/tools/compare", params={"ids": "1,2"})
+    assert response.status_code == 200
+    assert [tool["id"] for tool in response.json()] == [1, 2]
+
+
+def test_compare_keeps_requested_order(client):
+    response = client.get("/api/tools/compare", params={"ids": "3,1"})
+    assert [tool["id"] for tool in response.json()] == [3, 1]
+
+
+def test_compare_rejects_more_than_three_ids(client):
+    response = client.get("/api/tools/compare", params={"ids": "1,2,3,4"})
+    assert response.status_code == 400
+
+
+def test_external_edit_swaps_in_a_new_cache_snapshot(client, data_file):
+    before = client.get("/api/tools").json()
+    old_snapshot = main._CACHE
+
+    payload = orjson.loads(data_file.read_bytes())
+    payload["tools"] = payload["tools"][:2]
+    data_file.write_bytes(orjson.dumps(payload))
+
+    assert len(client.get("/api/tools").json()) == 2
+    assert main._CACHE is not old_snapshot
+    assert len(old_snapshot["published"]) == len(before)
+
+
+def _stored_ids(data_file):
+    return [tool["id"] for tool in orjson.loads(data_file.read_bytes())["tools"]]
+
+
+async def _wait_for_flush(timeout=5.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while main._PENDING["tools"] is not None:
+        assert loop.time() < deadline, "pending tools were never flushed"
+        await asyncio.sleep(0.01)
+
+
+def test_admin_change_is_visible_at_once_and_saved_on_shutdown(data_file):
+    with TestClient(main.app) as client:
+        response = client.post("/api/admin/tools", json={
+            "name": "New", "description": "d", "category": "c",
+            "pricing": "free", "website": "https://example.com"})
+        assert response.status_code == 201
+        new_id = response.json()["id"]
+        assert client.get(f"/api/tools/{new_id}").status_code == 200
+
+    assert new_id in _stored_ids(data_file)
+
+
+def test_change_committed_during_a_flush_is_not_dropped(data_file, monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+    real_save = main._save_changes
+
+    def slow_save(*args):
+        started.set()
+        release.wait(5)
+        return real_save(*args)
+
+    monkeypatch.setattr(main, "_save_changes", slow_save)
+
+    async def scenario():
+        await main.start_background_writer()
+        tools = list((await main._load_cache())["tools"])
+        await main._commit_tools(tools[:-1], ("delete", tools[-1]["id"]))
+        await asyncio.to_thread(started.wait, 5)
+        await main._commit_tools(tools[:-2], ("delete", tools[-2]["id"]))
+        release.set()
+        await _wait_for_flush()
+        await main.stop_background_writer()
+        return tools
+
+    tools = asyncio.run(scenario())
+    assert _stored_ids(data_file) == [tool["id"] for tool in tools[:-2]]
+
+
+def test_workers_sharing_a_file_keep_each_others_changes(data_file,
+                                                          monkeypatch):
+    spec = importlib.util.spec_from_file_location("other_worker",
+                                                  ROOT / "main.py")
+    other = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(other)
+    monkeypatch.setattr(other, "DATA_FILE", data_file)
+    monkeypatch.setattr(other, "LOCK_FILE", data_file.with_suffix(".lock"))
+
+    async def rename(worker, tool_id, name):
+        cache = await worker._load_cache()
+        tools = list(cache["tools"])
+        index = cache["by_id_index"][tool_id]
+        tools[index] = {**tools[index], "name": name}
+        await worker._commit_tools(tools, ("update", tools[index]))
+
+    async def create(worker, name):
+        cache = await worker._load_cache()
+        new_tool = main.normalize_tool({"id": cache["max_id"] + 1,
+                                        "name": name})
+        await worker._commit_tools([*cache["tools"], new_tool],
+                                   ("create", new_tool))
+
+    async def scenario():
+        for worker in (main, other):
+            await worker.start_background_writer()
+        await rename(main, 1, "A-edit")
+        await create(main, "A-new")
+        await rename(other, 2, "B-edit")
+        await create(other, "B-new")
+        for worker in (main, other):
+            await worker.stop_background_writer()
+
+    asyncio.run(scenario())
+    stored = orjson.loads(data_file.read_bytes())["tools"]
+    names = [tool["name"] for tool in stored]
+    assert names[:2] == ["A-edit", "B-edit"]
+    assert names[-2:] == ["A-new", "B-new"]
+    assert len({tool["id"] for tool in stored}) == len(stored)
+
+
+def test_failed_flush_is_retried(data_file, monkeypatch):
+    calls = []
+    real_save = main._save_changes
+
+    def flaky_save(*args):
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("disk went away")
+        return real_save(*args)
+
+    monkeypatch.setattr(main, "_save_changes", flaky_save)
+    monkeypatch.setattr(main, "WRITE_RETRY_SECONDS", 0.01)
+
+    async def scenario():
+        await main.start_background_writer()
+        tools = list((await main._load_cache())["tools"])
+        await main._commit_tools(tools[:-1], ("delete", tools[-1]["id"]))
+        await _wait_for_flush()
+        await main.stop_background_writer()
+        return tools
+
+    tools = asyncio.run(scenario())
+    assert len(calls) == 2
+    assert _stored_ids(data_file) == [tool["id"] for tool in tools[:-1]]
+
+
+def test_missing_data_file_is_cached_as_empty(client, data_file, monkeypatch):
+    data_file.unlink()
+    reads = []
+    real_read_snapshot = main._read_snapshot
+
+    def counting_read_snapshot():
+        reads.append(1)
+        return real_read_snapshot()
+
+    monkeypatch.setattr(main, "_read_snapshot", counting_read_snapshot)
+
+    for _ in range(3):
+        assert client.get("/api/tools").json() == []
+    assert len(reads) == 1
+
+    shutil.copy(ROOT / "data" / "tools.json", data_file)
+    assert client.get("/api/tools").json()
+    assert len(reads) == 2
+
+
+def test_legacy_list_file_is_migrated_to_envelope(client, data_file):
+    tools = orjson.loads(data_file.read_bytes())["tools"]
+    legacy = [{**tools[0], "tags": "a, b", "published": "yes"}]
+    data_file.write_bytes(orjson.dumps(legacy))
+
+    response = client.get("/api/tools")
+    assert response.status_code == 200
+    assert response.json()[0]["tags"] == ["a", "b"]
+
+    payload = orjson.loads(data_file.read_bytes())
+    assert payload["schema_version"] == main.SCHEMA_VERSION
+    assert payload["tools"][0]["tags"] == ["a", "b"]
+
+
+def test_hand_edited_envelope_records_are_normalized(client, data_file):
+    payload = orjson.loads(data_file.read_bytes())
+    tools = payload["tools"]
+    del tools[0]["features"]
+    tools[1]["tags"] = "art, images"
+    del tools[2]["name"]
+    tools[3]["id"] = "not-a-number"
+    data_file.write_bytes(orjson.dumps(payload))
+
+    response = client.get("/api/tools")
+    assert response.status_code == 200
+    ids = [tool["id"] for tool in response.json()]
+    assert ids[:3] == [tools[0]["id"], tools[1]["id"], tools[2]["id"]]
+    assert "not-a-number" not in ids
+
+    assert client.get(f"/api/tools/{tools[0]['id']}").json()["features"] == []
+    assert client.get(f"/api/tools/{tools[1]['id']}").json()["tags"] == [
+        "art", "images"]
+    assert client.get("/api/categories").status_code == 200
+
+
+def test_admin_save_keeps_records_it_could_not_read(data_file):
+    payload = orjson.loads(data_file.read_bytes())
+    payload["tools"][3]["id"] = "4a"
+    data_file.write_bytes(orjson.dumps(payload))
+
+    with TestClient(main.app) as client:
+        response = client.patch("/api/admin/tools/1", json={"name": "Renamed"})
+        assert response.status_code == 200
+
+    stored = orjson.loads(data_file.read_bytes())["tools"]
+    assert stored[0]["name"] == "Renamed"
+    assert payload["tools"][3] in stored
+
+
+def test_repeated_ids_use_first_record_and_delete_all(client, data_file):
+    tools = orjson.loads(data_file.read_bytes())["tools"]
+    legacy = [{k: v for k, v in tool.items() if k != "id"} for tool in tools[:3]]
+    data_file.write_bytes(orjson.dumps(legacy))
+
+    assert client.get("/api/tools/0").json()["name"] == tools[0]["name"]
+
+    assert client.delete("/api/admin/tools/0").status_code == 200
+    assert client.get("/api/admin/tools").json() == []
+    assert client.delete("/api/admin/tools/0").status_code == 404
+
+
+@pytest.mark.parametrize("lock_exists", [False, True])
+def test_reads_do_not_need_write_access(data_file, monkeypatch, lock_exists):
+    lock_file = data_file.with_suffix(".lock")
+    if lock_exists:
+        lock_file.touch()
+    real_open = os.open
+
+    def open_without_create(path, flags, *args):
+        if flags & (os.O_CREAT | os.O_WRONLY | os.O_RDWR):
+            raise PermissionError(13, "Read-only data directory", str(path))
+        return real_open(path, flags, *args)
+
+    monkeypatch.setattr(os, "open", open_without_create)
+    records, needs_migration = main.read_tools_file()
+
+    assert not needs_migration
+    assert len(records) == len(orjson.loads(data_file.read_bytes())["tools"])
+    assert lock_file.exists() == lock_exists
+
+
+def _search_ids(client, search):
+    response = client.get("/api/tools", params={"search": search})
+    assert response.status_code == 200
+    return [tool["id"] for tool in response.json()]
+
+
+def test_repeated_search_term_matches_like_a_single_term(client):
+    assert _search_ids(client, "chat")
+    assert _search_ids(client, "chat chat") == _search_ids(client, "chat")
+    assert _search_ids(client, " Chat ") == _search_ids(client, "chat")
+
+
+def test_multi_word_search_requires_every_word(client):
+    ids = _search_ids(client, "ai code")
+    assert ids
+    assert set(ids) <= set(_search_ids(client, "ai"))
+    assert set(ids) <= set(_search_ids(client, "code"))
+
+
+def test_whitespace_search_does_not_filter(client):
+    assert _search_ids(client, "   ") == _search_ids(client, "")